@@ -0,0 +1,102 @@
+"""
+Compare embedding backends on throughput and retrieval recall.
+
+Usage:
+    python benchmark_embeddings.py --files docs/*.pdf --backends huggingface onnx onnx-int8
+
+Recall@k is measured against the baseline backend (the first one listed):
+for every sampled query chunk, the top-k neighbours found with the candidate
+backend's vectors are compared to the top-k found with the baseline's.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from embedding_engine import EMBEDDING_BACKENDS, get_embedding_backend
+from ingestion_engine import UniversalLoader
+
+
+class _LocalFile:
+    """Minimal stand-in for an uploaded file so UniversalLoader can read from disk."""
+    def __init__(self, path: str):
+        self.name = path
+        self._path = path
+
+    def getbuffer(self):
+        with open(self._path, "rb") as f:
+            return f.read()
+
+
+def load_corpus(paths, limit: int) -> list:
+    loader = UniversalLoader()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = []
+    for path in paths:
+        text = loader.process_upload(_LocalFile(path))
+        if text and not text.startswith("Error"):
+            chunks.extend(splitter.split_text(text))
+
+    if not chunks:
+        # Synthetic fallback so the benchmark runs without sample documents
+        rng = random.Random(0)
+        words = ("revenue growth market customer product cloud security data model "
+                 "pipeline latency cost team roadmap quarter risk platform launch").split()
+        chunks = [" ".join(rng.choices(words, k=150)) for _ in range(limit)]
+
+    return chunks[:limit]
+
+
+def top_k(vectors: np.ndarray, query_idx: np.ndarray, k: int) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    normalized = vectors / np.clip(norms, 1e-12, None)
+    scores = normalized[query_idx] @ normalized.T
+    scores[np.arange(len(query_idx)), query_idx] = -np.inf  # exclude self-match
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", nargs="*", default=[], help="Documents to build the corpus from.")
+    parser.add_argument("--backends", nargs="+", default=list(EMBEDDING_BACKENDS),
+                        choices=list(EMBEDDING_BACKENDS), help="Backends to compare; the first is the baseline.")
+    parser.add_argument("--limit", type=int, default=1000, help="Maximum number of chunks to embed.")
+    parser.add_argument("--queries", type=int, default=100, help="Number of chunks used as queries.")
+    parser.add_argument("-k", type=int, default=5, help="Neighbours per query (matches the retriever).")
+    args = parser.parse_args()
+
+    chunks = load_corpus(args.files, args.limit)
+    query_idx = np.array(random.Random(0).sample(range(len(chunks)), min(args.queries, len(chunks))))
+    print(f"Corpus: {len(chunks)} chunks, {len(query_idx)} queries, k={args.k}\n")
+
+    baseline = None
+    print(f"{'backend':<14}{'load (s)':>10}{'chunks/s':>12}{'cosine':>10}{'recall@k':>10}")
+    for name in args.backends:
+        start = time.perf_counter()
+        embeddings = get_embedding_backend(name)
+        embeddings.embed_query("warm up")  # include lazy model load in load time
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectors = np.asarray(embeddings.embed_documents(chunks), dtype=np.float32)
+        throughput = len(chunks) / (time.perf_counter() - start)
+        neighbours = top_k(vectors, query_idx, args.k)
+
+        if baseline is None:
+            baseline = (vectors, neighbours)
+            cosine, recall = 1.0, 1.0
+        else:
+            base_vectors, base_neighbours = baseline
+            cosine = float(np.mean(np.sum(vectors * base_vectors, axis=1) / (
+                np.linalg.norm(vectors, axis=1) * np.linalg.norm(base_vectors, axis=1))))
+            recall = float(np.mean([
+                len(set(a) & set(b)) / args.k for a, b in zip(neighbours, base_neighbours)
+            ]))
+
+        print(f"{name:<14}{load_time:>10.2f}{throughput:>12.1f}{cosine:>10.4f}{recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,51 @@
 import os
+import json
+import shutil
+import sqlite3
 import logging
+import threading
 import chromadb
-from typing import List
+import numpy as np
+from typing import List, Optional
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 from ingestion_engine import UniversalLoader
+from embedding_engine import CachedEmbeddings, get_embedding_backend
+from lru_cache import LRUCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+COLLECTION_NAME = "rag_ppt_collection"
+EXPORT_BATCH_SIZE = 1000
+
 class DBManager:
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    def __init__(self, persist_directory: str = "./chroma_db", embedding_backend: Optional[str] = None):
         self.persist_directory = persist_directory
         self.loader = UniversalLoader()
         
         # Initialize Embeddings
-        # Using a standard efficient model for general purpose RAG
-        self.embedding_function = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        # All backends serve all-MiniLM-L6-v2, so they can share one collection
+        if embedding_backend is None:
+            embedding_backend = os.getenv("EMBEDDING_BACKEND", "huggingface")
+        self.embedding_backend = embedding_backend
+        self.embedding_function = CachedEmbeddings(get_embedding_backend(embedding_backend))
         
         # Initialize persistent Chroma Vector Store
         self._client = chromadb.PersistentClient(path=self.persist_directory)
         self.vector_store = Chroma(
             client=self._client,
-            collection_name="rag_ppt_collection",
+            collection_name=COLLECTION_NAME,
             embedding_function=self.embedding_function,
         )
+        # Serializes writes so snapshots see a consistent store
+        self._write_lock = threading.Lock()
+        
+        # Top-k results keyed by collection version; bumped on every write
+        self._collection_version = 0
+        self._result_cache = LRUCache(maxsize=256)
         
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
@@ -92,7 +108,12 @@ class DBManager:
 
         if documents_to_add:
             try:
-                self.vector_store.add_documents(documents=documents_to_add)
+                with self._write_lock:
+                    try:
+                        self.vector_store.add_documents(documents=documents_to_add)
+                    finally:
+                        # Bump even on failure: a partial write still changes results
+                        self._collection_version += 1
                 logger.info(f"Added {len(documents_to_add)} chunks to ChromaDB.")
             except Exception as e:
                 logger.error(f"Error adding documents to ChromaDB: {e}")
@@ -107,3 +128,205 @@ class DBManager:
             search_kwargs={"k": 5}
         )
 
+    def retrieve(self, query: str, k: int = 5, filters: Optional[dict] = None) -> List[Document]:
+        """
+        Similarity search with in-process caching.
+
+        Results are cached per (collection, normalized query, k, filters) and
+        dropped once the collection version changes; the query embedding is
+        memoized separately, so a repeat query skips both the model and the index.
+
+        Args:
+            query: Free-text query, e.g. the presentation topic.
+            k: Number of chunks to return.
+            filters: Optional Chroma metadata filter, e.g. {"source": "report.pdf"}.
+
+        Returns:
+            List[Document]: The top-k matching chunks.
+        """
+        # The model's tokenizer is uncased, so case and spacing don't change the embedding
+        normalized = " ".join(query.split()).lower()
+        filter_key = json.dumps(filters, sort_keys=True) if filters else None
+        key = (COLLECTION_NAME, self._collection_version, normalized, k, filter_key)
+
+        docs = self._result_cache.get(key)
+        if docs is None:
+            embedding = self.embedding_function.embed_query(normalized)
+            docs = tuple(self.vector_store.similarity_search_by_vector(embedding, k=k, filter=filters))
+            self._result_cache.put(key, docs)
+        return [Document(page_content=d.page_content, metadata=dict(d.metadata)) for d in docs]
+
+    def export_collection(self, export_dir: str) -> int:
+        """
+        Export ids, documents, metadata and raw embeddings of the collection.
+
+        Embeddings are streamed into a memory-mappable `embeddings.npy`
+        (float32, one row per record); ids, documents and metadata go to
+        `records.jsonl` in the same row order.
+
+        Args:
+            export_dir: Directory to write the export to (created if missing).
+
+        Returns:
+            int: Number of exported records.
+        """
+        collection = self.vector_store._collection
+        os.makedirs(export_dir, exist_ok=True)
+
+        embeddings = None
+        written = 0
+        # Hold the write lock so paging by offset sees a stable collection
+        with self._write_lock, open(os.path.join(export_dir, "records.jsonl"), "w", encoding="utf-8") as records:
+            total = collection.count()
+            while written < total:
+                batch = collection.get(
+                    limit=EXPORT_BATCH_SIZE,
+                    offset=written,
+                    include=["documents", "metadatas", "embeddings"],
+                )
+                if not batch["ids"]:
+                    break
+
+                vectors = np.asarray(batch["embeddings"], dtype=np.float32)
+                if embeddings is None:
+                    embeddings = np.lib.format.open_memmap(
+                        os.path.join(export_dir, "embeddings.npy"),
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(total, vectors.shape[1]),
+                    )
+                end = min(written + len(vectors), total)
+                embeddings[written:end] = vectors[:end - written]
+
+                for record_id, document, metadata in zip(
+                    batch["ids"][:end - written], batch["documents"], batch["metadatas"]
+                ):
+                    records.write(json.dumps(
+                        {"id": record_id, "document": document, "metadata": metadata}
+                    ) + "\n")
+                written = end
+
+            if written != total:
+                raise RuntimeError(f"Collection returned {written} of {total} records during export.")
+
+        if embeddings is not None:
+            embeddings.flush()
+            dimension = embeddings.shape[1]
+            del embeddings
+        else:
+            dimension = 0
+
+        with open(os.path.join(export_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "collection": COLLECTION_NAME,
+                "count": written,
+                "dimension": dimension,
+                "embedding_backend": self.embedding_backend,
+            }, f, indent=2)
+
+        logger.info(f"Exported {written} records to {export_dir}.")
+        return written
+
+    def import_collection(self, export_dir: str) -> int:
+        """
+        Bulk-load an export produced by `export_collection` without re-embedding.
+
+        Records are upserted, so importing the same export twice is harmless.
+
+        Args:
+            export_dir: Directory containing manifest.json, records.jsonl and embeddings.npy.
+
+        Returns:
+            int: Number of imported records.
+        """
+        with open(os.path.join(export_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["collection"] != COLLECTION_NAME:
+            raise ValueError(
+                f"Export is of collection '{manifest['collection']}', expected '{COLLECTION_NAME}'."
+            )
+        if manifest["count"] == 0:
+            return 0
+
+        # Validate the whole export up front so a truncated file can't cause a partial import
+        embeddings = np.load(os.path.join(export_dir, "embeddings.npy"), mmap_mode="r")
+        if embeddings.shape != (manifest["count"], manifest["dimension"]):
+            raise ValueError(
+                f"embeddings.npy has shape {embeddings.shape}, but the manifest "
+                f"expects ({manifest['count']}, {manifest['dimension']})."
+            )
+        with open(os.path.join(export_dir, "records.jsonl"), "r", encoding="utf-8") as records:
+            record_count = sum(1 for _ in records)
+        if record_count != manifest["count"]:
+            raise ValueError(
+                f"records.jsonl has {record_count} records, but the manifest expects {manifest['count']}."
+            )
+
+        # Only compare against the backend if its dimension is already known,
+        # to avoid loading the model just for this check
+        dimension = self.embedding_function.dimension
+        if dimension is not None and dimension != manifest["dimension"]:
+            raise ValueError(
+                f"Export has {manifest['dimension']}-dimensional embeddings, "
+                f"but backend '{self.embedding_backend}' produces {dimension}."
+            )
+
+        collection = self.vector_store._collection
+        imported = 0
+        with self._write_lock, open(os.path.join(export_dir, "records.jsonl"), "r", encoding="utf-8") as records:
+            try:
+                batch = []
+                for line in records:
+                    batch.append(json.loads(line))
+                    if len(batch) == EXPORT_BATCH_SIZE:
+                        self._upsert_batch(collection, batch, embeddings[imported:imported + len(batch)])
+                        imported += len(batch)
+                        batch = []
+                if batch:
+                    self._upsert_batch(collection, batch, embeddings[imported:imported + len(batch)])
+                    imported += len(batch)
+            finally:
+                # Earlier batches may already be in Chroma if a later one fails
+                self._collection_version += 1
+
+        logger.info(f"Imported {imported} records from {export_dir}.")
+        return imported
+
+    def _upsert_batch(self, collection, batch: list, vectors: np.ndarray) -> None:
+        collection.upsert(
+            ids=[r["id"] for r in batch],
+            documents=[r["document"] for r in batch],
+            metadatas=[r["metadata"] for r in batch],
+            embeddings=np.asarray(vectors, dtype=np.float32).tolist(),
+        )
+
+    def snapshot(self, snapshot_dir: str) -> str:
+        """
+        Take a consistent point-in-time copy of the persist directory.
+
+        Writes are blocked while the copy runs. The SQLite database is copied
+        with SQLite's online backup API; index segment files are copied as-is.
+
+        Args:
+            snapshot_dir: Target directory; must not exist yet.
+
+        Returns:
+            str: Path of the snapshot, usable as `persist_directory` on a new node.
+        """
+        sqlite_name = "chroma.sqlite3"
+        with self._write_lock:
+            shutil.copytree(
+                self.persist_directory,
+                snapshot_dir,
+                ignore=shutil.ignore_patterns(f"{sqlite_name}*"),
+            )
+            source = sqlite3.connect(os.path.join(self.persist_directory, sqlite_name))
+            target = sqlite3.connect(os.path.join(snapshot_dir, sqlite_name))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+        logger.info(f"Snapshot of {self.persist_directory} written to {snapshot_dir}.")
+        return snapshot_dir
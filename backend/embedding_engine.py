@@ -0,0 +1,148 @@
+import os
+import logging
+import tempfile
+from functools import cached_property
+from typing import Callable, List, Optional
+
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+from langchain_core.embeddings import Embeddings
+
+from lru_cache import LRUCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class QuantizedONNXMiniLM_L6_V2(ONNXMiniLM_L6_V2):
+    """
+    Chroma's ONNX all-MiniLM-L6-v2, loaded as a dynamically int8-quantized copy.
+
+    The quantized model is written once next to the downloaded model.onnx.
+    """
+    @cached_property
+    def model(self):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        model_dir = os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME)
+        quantized_path = os.path.join(model_dir, "model_int8.onnx")
+        if not os.path.exists(quantized_path):
+            logger.info(f"Quantizing {MODEL_NAME} to int8 at {quantized_path}...")
+            # Quantize to a temp file and rename it into place, so concurrent
+            # workers or a crash mid-write never leave a truncated model behind
+            fd, tmp_path = tempfile.mkstemp(suffix=".onnx", dir=model_dir)
+            os.close(fd)
+            try:
+                quantize_dynamic(
+                    os.path.join(model_dir, "model.onnx"),
+                    tmp_path,
+                    weight_type=QuantType.QInt8,
+                )
+                os.replace(tmp_path, quantized_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        so = self.ort.SessionOptions()
+        so.log_severity_level = 3
+        so.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return self.ort.InferenceSession(
+            quantized_path,
+            providers=["CPUExecutionProvider"],
+            sess_options=so,
+        )
+
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """
+    all-MiniLM-L6-v2 served by ONNX Runtime instead of PyTorch.
+
+    Uses chromadb's ONNX embedding function, which produces vectors compatible
+    with the HuggingFace backend (same model, mean pooling, L2-normalized).
+    The model is not bundled: chromadb downloads it to ~/.cache/chroma on
+    first use, so offline hosts must pre-fetch it (see README).
+    """
+    def __init__(self, quantized: bool = False):
+        self.quantized = quantized
+
+    @cached_property
+    def _model(self):
+        model_class = QuantizedONNXMiniLM_L6_V2 if self.quantized else ONNXMiniLM_L6_V2
+        return model_class(preferred_providers=["CPUExecutionProvider"])
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return [[float(x) for x in vector] for vector in self._model(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Memoizes query embeddings of a wrapped backend in an LRU cache, so repeated
+    topics skip the model forward pass. Document embeddings are not cached.
+    """
+    def __init__(self, embeddings: Embeddings, maxsize: int = 1024):
+        self.embeddings = embeddings
+        self.cache = LRUCache(maxsize=maxsize)
+        # Vector size, known once the backend has produced an embedding
+        self.dimension: Optional[int] = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.embeddings.embed_documents(texts)
+        if vectors:
+            self.dimension = len(vectors[0])
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = tuple(self.embeddings.embed_query(text))
+            self.cache.put(text, vector)
+            self.dimension = len(vector)
+        return list(vector)
+
+
+def _huggingface_backend() -> Embeddings:
+    # Imported lazily so the ONNX backends never pay for the PyTorch import.
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model_name=MODEL_NAME)
+
+
+def _onnx_int8_backend() -> Embeddings:
+    # Quantization needs the `onnx` package; fail at startup rather than on
+    # the first request, since the model itself is loaded lazily.
+    import onnxruntime.quantization  # noqa: F401
+
+    return OnnxMiniLMEmbeddings(quantized=True)
+
+
+EMBEDDING_BACKENDS: dict[str, Callable[[], Embeddings]] = {
+    "huggingface": _huggingface_backend,
+    "onnx": lambda: OnnxMiniLMEmbeddings(),
+    "onnx-int8": _onnx_int8_backend,
+}
+
+
+def get_embedding_backend(name: str) -> Embeddings:
+    """
+    Build the embedding function registered under `name`.
+
+    Args:
+        name: One of the keys of EMBEDDING_BACKENDS.
+
+    Returns:
+        Embeddings: A LangChain-compatible embedding function.
+    """
+    factory = EMBEDDING_BACKENDS.get(name.lower().strip())
+    if not factory:
+        raise ValueError(
+            f"Unknown embedding backend '{name}'. "
+            f"Available: {', '.join(EMBEDDING_BACKENDS)}"
+        )
+    logger.info(f"Using embedding backend: {name}")
+    return factory()
@@ -100,8 +100,7 @@ async def generate_presentation(request: GenerateRequest):
         logger.info(f"Generating presentation for topic: {topic}")
         
         # Retrieve context
-        retriever = db_manager.get_retriever()
-        docs = retriever.invoke(topic)
+        docs = db_manager.retrieve(topic)
         context = "\n\n".join([d.page_content for d in docs])
         
         # Generate structure